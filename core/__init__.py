@@ -1,12 +1,13 @@
 """Core utilities for data generator framework."""
 
 from .base_generator import BaseGenerator, GenerationConfig
-from .schemas import TaskPair
+from .schemas import TaskPair, load_image
 from .output_writer import OutputWriter
 
 __all__ = [
     "BaseGenerator",
     "GenerationConfig",
     "TaskPair",
+    "load_image",
     "OutputWriter",
 ]
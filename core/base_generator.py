@@ -1,11 +1,30 @@
 """Base generator class."""
 
+import itertools
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterator, List, Optional, Sequence
 from pathlib import Path
 from pydantic import BaseModel, Field
 from .schemas import TaskPair
 
+logger = logging.getLogger(__name__)
+
+# Progress is logged about once per this many completions
+_LOG_EVERY = 64
+# Jobs kept queued per pool worker; the rest are submitted as slots free up
+_INFLIGHT_PER_WORKER = 2
+
+
+def _progress(msg: str, *args):
+    """Log progress; print it when the caller hasn't configured logging."""
+    if logger.hasHandlers():
+        logger.info(msg, *args)
+    else:
+        print(msg % args)
+
 
 class GenerationConfig(BaseModel):
     """Generation configuration."""
@@ -33,12 +52,63 @@ class BaseGenerator(ABC):
         """Generate a single task. Implement this in your generator."""
         pass
 
-    def generate_dataset(self) -> List[TaskPair]:
-        """Generate complete dataset."""
-        pairs = []
+    def generate_dataset_iter(self) -> Iterator[TaskPair]:
+        """Yield tasks as they are generated, so callers can stream them out."""
         for i in range(self.config.num_samples):
             task_id = f"{self.config.domain}_{i:04d}"
             pair = self.generate_task_pair(task_id)
-            pairs.append(pair)
             print(f"  Generated: {task_id}")
-        return pairs
+            yield pair
+
+    def generate_dataset(self) -> List[TaskPair]:
+        """Generate complete dataset."""
+        return list(self.generate_dataset_iter())
+
+    def _parallel_render_iter(
+        self,
+        fn: Callable,
+        args_list: Sequence,
+        workers: int,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        mp_context=None,
+    ) -> Iterator[TaskPair]:
+        """
+        Run fn over args_list in a process pool, yielding pairs as they
+        complete. Each entry of args_list is a batch (list) of jobs and fn
+        returns a list of result dicts, one per job, each with a "success"
+        flag; successful results go through self._result_to_pair(result),
+        which subclasses calling this must define.
+
+        Only a bounded window of jobs is submitted at a time, so the pool's
+        call queue and future bookkeeping stay O(workers) rather than O(n).
+        """
+        n = sum(len(batch) for batch in args_list)
+        fail, done, next_log = 0, 0, _LOG_EVERY
+        t0 = time.time()
+        args_iter = iter(args_list)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=initializer, initargs=initargs) as ex:
+            pending = {ex.submit(fn, a)
+                       for a in itertools.islice(args_iter, workers * _INFLIGHT_PER_WORKER)}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    for r in fut.result():
+                        if r["success"]:
+                            yield self._result_to_pair(r)
+                        else:
+                            fail += 1
+                        done += 1
+                    for a in itertools.islice(args_iter, 1):
+                        pending.add(ex.submit(fn, a))
+                    if done >= next_log or done == n:
+                        next_log = done + _LOG_EVERY
+                        el = time.time() - t0
+                        rate = done / el if el > 0 else 0
+                        eta = (n - done) / rate / 60 if rate > 0 else 0
+                        _progress("  [%d/%d] ok=%d fail=%d rate=%.2f/s ETA=%.1fmin",
+                                  done, n, done - fail, fail, rate, eta)
+        ok = n - fail
+        _progress("Done in %.1fmin. Success: %d/%d (%.1f%%)",
+                  (time.time() - t0) / 60, ok, n, 100 * ok / max(n, 1))
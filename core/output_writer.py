@@ -2,15 +2,32 @@
 
 import shutil
 from pathlib import Path
-from typing import List
-from .schemas import TaskPair
+from typing import Iterable
+from .schemas import TaskPair, load_image
 
 
 def _ensure_rgb(image):
     """Convert image to RGB if needed."""
+    image = load_image(image)
     return image.convert('RGB') if image.mode != 'RGB' else image
 
 
+def _is_rgb_png(path) -> bool:
+    """True if path is an 8-bit RGB PNG (IHDR bit depth 8, color type 2)."""
+    with open(path, "rb") as f:
+        header = f.read(26)
+    return header[:8] == b"\x89PNG\r\n\x1a\n" and header[24:26] == b"\x08\x02"
+
+
+def _write_png(image, path: Path):
+    """Save image as RGB PNG; RGB PNG paths (rendered keyframes) are copied as-is."""
+    if isinstance(image, (str, Path)) and Path(image).suffix.lower() == ".png" \
+            and _is_rgb_png(image):
+        shutil.copyfile(image, path)
+    else:
+        _ensure_rgb(image).save(path)
+
+
 class OutputWriter:
     """Writes tasks to standard folder structure."""
 
@@ -24,10 +41,10 @@ class OutputWriter:
         task_dir.mkdir(parents=True, exist_ok=True)
 
         # Write images
-        _ensure_rgb(task_pair.first_image).save(task_dir / "first_frame.png")
+        _write_png(task_pair.first_image, task_dir / "first_frame.png")
 
         if task_pair.final_image:
-            _ensure_rgb(task_pair.final_image).save(task_dir / "final_frame.png")
+            _write_png(task_pair.final_image, task_dir / "final_frame.png")
 
         # Write prompt
         (task_dir / "prompt.txt").write_text(task_pair.prompt)
@@ -40,7 +57,7 @@ class OutputWriter:
 
         return task_dir
 
-    def write_dataset(self, task_pairs: List[TaskPair]) -> Path:
+    def write_dataset(self, task_pairs: Iterable[TaskPair]) -> Path:
         """Write all tasks to disk."""
         for pair in task_pairs:
             self.write_task_pair(pair)
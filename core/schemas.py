@@ -1,16 +1,41 @@
 """Pydantic schemas for task data."""
 
+from pathlib import Path
 from typing import Optional, Any
+from PIL import Image
 from pydantic import BaseModel
 
+try:
+    import pyspng  # optional: faster PNG decoder than Pillow's
+except ImportError:
+    pyspng = None
+
+
+def read_png_rgb(path):
+    """Decode a PNG file to an HxWx3 uint8 array with pyspng (must be installed)."""
+    arr = pyspng.load(Path(path).read_bytes())
+    if arr.ndim == 2:
+        arr = arr[..., None].repeat(3, axis=2)
+    return arr[..., :3]
+
+
+def load_image(image) -> Image.Image:
+    """Return a PIL image for a TaskPair image field (PIL Image or file path)."""
+    if isinstance(image, (str, Path)):
+        if pyspng is not None and Path(image).suffix.lower() == ".png":
+            return Image.fromarray(read_png_rgb(image))
+        with Image.open(image) as img:
+            return img.convert("RGB")
+    return image
+
 
 class TaskPair(BaseModel):
     """A task pair with initial and final states."""
     task_id: str
     domain: str
     prompt: str
-    first_image: Any  # PIL Image
-    final_image: Optional[Any] = None  # PIL Image
+    first_image: Any  # PIL Image or path, decoded on demand via load_image
+    final_image: Optional[Any] = None  # PIL Image or path
     ground_truth_video: Optional[str] = None  # Path to video
 
     class Config:
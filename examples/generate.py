@@ -13,17 +13,21 @@ Usage:
 """
 
 import argparse
+import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core import OutputWriter
+from shared.objects import load_objects
+from shared.renderer import start_mps_daemon
 from tasks import get_task, TASK_NAMES
 
 
-def run_task(task_name, args):
-    """Run a single task generator."""
+def run_task(task_name, args, objects=None):
+    """Run a single task generator (objects: pre-resolved paths, see load_objects)."""
     task_module = get_task(task_name)
 
     config = task_module.TaskConfig(
@@ -34,18 +38,24 @@ def run_task(task_name, args):
         fps=args.fps,
         duration=args.duration,
         workers=args.workers,
+        render_engine=args.engine,
+        render_device=args.device,
+        use_mps=args.mps,
         blender_path=args.blender,
         object_list=args.objects,
     )
 
-    generator = task_module.TaskGenerator(config)
-    tasks = generator.generate_dataset()
-
+    generator = task_module.TaskGenerator(config, objects)
     writer = OutputWriter(Path(args.output))
-    writer.write_dataset(tasks)
 
-    print(f"  -> {len(tasks)} tasks in {args.output}/{config.domain}_task/")
-    return len(tasks)
+    # Write each task as it finishes instead of holding the whole dataset
+    count = 0
+    for pair in generator.generate_dataset_iter():
+        writer.write_task_pair(pair)
+        count += 1
+
+    print(f"  -> {count} tasks in {args.output}/{config.domain}_task/")
+    return count
 
 
 def main():
@@ -61,13 +71,23 @@ def main():
     parser.add_argument("--output", type=str, default="data/questions")
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--outer-workers", type=int, default=len(TASK_NAMES),
+                        help="Task types generated concurrently for 'all' "
+                             "(--workers is split between them)")
     parser.add_argument("--resolution", type=int, default=1024)
     parser.add_argument("--fps", type=int, default=16)
     parser.add_argument("--duration", type=float, default=4.0)
+    parser.add_argument("--engine", type=str, default="BLENDER_EEVEE",
+                        help="Blender render engine (BLENDER_EEVEE or CYCLES)")
+    parser.add_argument("--device", type=str, default="OPTIX",
+                        help="Cycles compute device (OPTIX, CUDA, HIP, METAL, ONEAPI, CPU)")
+    parser.add_argument("--mps", action="store_true",
+                        help="Run Blender workers under an NVIDIA MPS daemon")
     parser.add_argument("--blender", type=str, default=None)
     parser.add_argument("--objects", type=str, default=None)
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     print(f"Objaverse 3D Video Generator")
     print(f"  Task: {args.task}")
@@ -77,11 +97,20 @@ def main():
 
     if args.task == "all":
         per_task = args.num_samples // len(TASK_NAMES)
-        total = 0
-        for name in TASK_NAMES:
-            print(f"=== {name} ({per_task} samples) ===")
-            args.num_samples = per_task
-            total += run_task(name, args)
+        outer = max(1, min(args.outer_workers, len(TASK_NAMES)))
+        args.num_samples = per_task
+        args.workers = max(1, args.workers // outer)
+        print(f"=== {', '.join(TASK_NAMES)} ({per_task} samples each, "
+              f"{outer} concurrent x {args.workers} workers) ===")
+        if args.mps:
+            # Own the MPS daemon here so one task finishing doesn't stop it under the others
+            start_mps_daemon()
+        # Resolve (and download) objects once here; concurrent objaverse downloads
+        # of the same uids from several task processes race on the same files
+        objects = load_objects(args.objects)
+        with ProcessPoolExecutor(max_workers=outer) as ex:
+            futs = [ex.submit(run_task, name, args, objects) for name in TASK_NAMES]
+            total = sum(f.result() for f in futs)
         print(f"\nTotal: {total} tasks across {len(TASK_NAMES)} types")
     else:
         run_task(args.task, args)
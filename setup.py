@@ -16,4 +16,5 @@ setup(
     packages=find_packages(include=["core", "core.*", "shared", "shared.*", "tasks", "tasks.*"]),
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={"fast-png": ["pyspng>=0.1.1"]},
 )
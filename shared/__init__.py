@@ -1,6 +1,6 @@
 """Shared utilities: Blender rendering, object loading."""
 
-from .renderer import render_video_task
-from .objects import load_objects
+from .renderer import render_video_task, BlenderWorkerPool
+from .objects import load_objects, share_objects, attach_objects
 
-__all__ = ["render_video_task", "load_objects"]
+__all__ = ["render_video_task", "BlenderWorkerPool", "load_objects", "share_objects", "attach_objects"]
@@ -4,21 +4,28 @@ Unified Blender rendering script for all 4 task types.
 Runs as a Blender subprocess — self-contained, no external imports.
 
 Usage (called by shared/renderer.py, not directly):
-    blender --background --python shared/blender_render.py -- \
-        --task_config '{"task_type":"shape_extrapolation",...}' \
-        --object_paths '["path1.glb"]' \
-        --output_dir /path/to/output
+    # job.json: {"task_config": {...}, "object_paths": [...], "output_dir": "..."}
+    blender --background --python shared/blender_render.py -- --job_file job.json
+
+    # Persistent worker: one JSON job per stdin line, "RENDER_DONE" after each
+    blender --background --python shared/blender_render.py -- --worker
 """
 
 import argparse
+import hashlib
 import json
 import math
+import os
+import shutil
+import subprocess
 import sys
+import traceback
 from pathlib import Path
 
 try:
     import bpy
     import mathutils
+    import numpy as np
 except ImportError:
     print("Error: Must run inside Blender")
     sys.exit(1)
@@ -30,20 +37,63 @@ except ImportError:
 
 def reset_scene():
     bpy.ops.wm.read_factory_settings(use_empty=True)
+    # Nothing is ever undone; skip undo pushes from importers and operators
+    bpy.context.preferences.edit.use_global_undo = False
+
+
+def setup_render_device(device="OPTIX"):
+    """Render Cycles on every GPU of the requested backend, or CPU if none is found."""
+    scene = bpy.context.scene
+    scene.cycles.device = "CPU"
+    addon = bpy.context.preferences.addons.get("cycles")
+    if device == "CPU" or addon is None:
+        return "CPU"
+    prefs = addon.preferences
+    for backend in dict.fromkeys((device, "OPTIX", "CUDA", "HIP", "METAL", "ONEAPI")):
+        try:
+            prefs.compute_device_type = backend
+        except TypeError:
+            continue
+        prefs.get_devices()
+        gpus = [d for d in prefs.devices if d.type == backend]
+        if not gpus:
+            continue
+        for d in prefs.devices:
+            d.use = d.type == backend
+        scene.cycles.device = "GPU"
+        return backend
+    return "CPU"
 
 
-def setup_render_settings(resolution=1024):
+# Keyframe PNGs are scratch files re-encoded by OutputWriter; ~zlib level 1
+PNG_COMPRESSION = 15
+
+
+def setup_render_settings(resolution=1024, engine="BLENDER_EEVEE", device="OPTIX",
+                          taa_samples=8, tile_size=256):
     scene = bpy.context.scene
     scene.render.resolution_x = resolution
     scene.render.resolution_y = resolution
     scene.render.resolution_percentage = 100
-    scene.render.engine = "BLENDER_EEVEE"
-    scene.eevee.taa_render_samples = 8
-    scene.eevee.use_gtao = True
-    scene.eevee.use_ssr = False
-    scene.eevee.use_bloom = False
+    if engine == "BLENDER_EEVEE" and bpy.app.version >= (4, 2, 0):
+        engine = "BLENDER_EEVEE_NEXT"
+    scene.render.engine = engine
+    if engine == "CYCLES":
+        backend = setup_render_device(device)
+        scene.cycles.samples = 32
+        scene.cycles.tile_size = tile_size
+        scene.cycles.use_denoising = True
+        if backend == "OPTIX":
+            scene.cycles.denoiser = "OPTIX"
+    else:
+        scene.eevee.taa_render_samples = taa_samples
+    if engine == "BLENDER_EEVEE":
+        scene.eevee.use_gtao = True
+        scene.eevee.use_ssr = False
+        scene.eevee.use_bloom = False
     scene.render.image_settings.file_format = "PNG"
     scene.render.image_settings.color_mode = "RGBA"
+    scene.render.image_settings.compression = PNG_COMPRESSION
     scene.render.film_transparent = False
 
 
@@ -70,12 +120,14 @@ def setup_ground_plane(z=-1.2):
     plane.data.materials.append(mat)
 
 
-def setup_lighting(energy=5.0):
+def setup_lighting(energy=5.0, key_only=False):
     bpy.ops.object.light_add(type="SUN", location=(5, -5, 10))
     key = bpy.context.active_object
     key.name = "KeyLight"
     key.data.energy = energy
     key.rotation_euler = (math.radians(45), 0, math.radians(-45))
+    if key_only:
+        return
 
     bpy.ops.object.light_add(type="SUN", location=(-5, -5, 5))
     fill = bpy.context.active_object
@@ -90,6 +142,21 @@ def setup_lighting(energy=5.0):
     rim.rotation_euler = (math.radians(-45), 0, math.radians(180))
 
 
+# EEVEE TAA samples per task (default 8); orbit motion hides the extra aliasing
+TAA_SAMPLES = {"shape_extrapolation": 4, "occlusion_dynamics": 4}
+
+
+def setup_scene(task_type):
+    """Background, ground plane and lights for a task type."""
+    setup_background()
+    if task_type == "zoom_consistency":
+        # Tight framing on a centered object: the ground plane is off-screen
+        setup_lighting(key_only=True)
+    else:
+        setup_ground_plane()
+        setup_lighting()
+
+
 def setup_camera(distance=3.5, elevation=25.0):
     bpy.ops.object.camera_add()
     camera = bpy.context.active_object
@@ -98,28 +165,91 @@ def setup_camera(distance=3.5, elevation=25.0):
     x = distance * math.cos(elev_rad)
     z = distance * math.sin(elev_rad)
     camera.location = (x, 0, z)
-    direction = mathutils.Vector((0, 0, 0)) - camera.location
-    rot_quat = direction.to_track_quat("-Z", "Y")
-    camera.rotation_euler = rot_quat.to_euler()
+    camera.rotation_euler = look_at_euler(np.array([[x, 0, z]]), (0, 0, 0))[0].tolist()
     bpy.context.scene.camera = camera
     camera.data.lens = 35
     camera.data.sensor_width = 32
     return camera
 
 
+# Config keys that shape the object-independent part of the scene
+TEMPLATE_KEYS = ("resolution", "engine", "device", "taa_samples", "tile_size",
+                 "camera_distance", "camera_elevation")
+
+
+def build_scene(config, task_type):
+    """Render settings, world, ground, lights and camera; returns the camera."""
+    reset_scene()
+    setup_render_settings(
+        resolution=config.get("resolution", 1024),
+        engine=config.get("engine", "BLENDER_EEVEE"),
+        device=config.get("device", "OPTIX"),
+        taa_samples=config.get("taa_samples", TAA_SAMPLES.get(task_type, 8)),
+        tile_size=config.get("tile_size", 256),
+    )
+    setup_scene(task_type)
+    return setup_camera(
+        distance=config.get("camera_distance", 3.5),
+        elevation=config.get("camera_elevation", 25.0),
+    )
+
+
+def load_scene(config, task_type, template=None):
+    """
+    build_scene(), or open a cached copy of it. With a template path, the first
+    job saves the built scene next to it (one file per task type and settings)
+    and later jobs just open that file.
+    """
+    if not template:
+        return build_scene(config, task_type)
+
+    settings = json.dumps({k: config.get(k) for k in TEMPLATE_KEYS}, sort_keys=True)
+    key = hashlib.sha1(settings.encode()).hexdigest()[:12]
+    template = Path(template)
+    path = template.with_name(f"{template.stem}_{task_type}_{key}.blend")
+
+    if path.exists():
+        bpy.ops.wm.open_mainfile(filepath=str(path), load_ui=False)
+        bpy.context.preferences.edit.use_global_undo = False
+        # Compute-device preferences live outside the .blend
+        if bpy.context.scene.render.engine == "CYCLES":
+            setup_render_device(config.get("device", "OPTIX"))
+        return bpy.data.objects["RenderCamera"]
+
+    camera = build_scene(config, task_type)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=str(tmp), copy=True)
+    os.replace(tmp, path)
+    return camera
+
+
 # ============================================================
 # Object Import
 # ============================================================
 
+def deselect_all():
+    # Direct RNA writes; bpy.ops.object.select_all walks the whole scene
+    for obj in list(bpy.context.view_layer.objects.selected):
+        obj.select_set(False)
+
+
 def import_object(filepath):
     filepath = str(filepath)
+    deselect_all()
     if filepath.endswith(".glb") or filepath.endswith(".gltf"):
         bpy.ops.import_scene.gltf(filepath=filepath)
     elif filepath.endswith(".obj"):
-        bpy.ops.import_scene.obj(filepath=filepath)
+        if bpy.app.version >= (3, 2, 0):
+            # Native C++ importer; the Python one is much slower (and gone in 4.0)
+            bpy.ops.wm.obj_import(filepath=filepath)
+        else:
+            bpy.ops.import_scene.obj(filepath=filepath)
     else:
         raise ValueError(f"Unsupported format: {filepath}")
-    return [obj for obj in bpy.context.selected_objects if obj.type == "MESH"]
+    # Importers leave exactly the new objects selected; read before anything else runs
+    imported = list(bpy.context.selected_objects)
+    return [obj for obj in imported if obj.type == "MESH"]
 
 
 def ensure_visible_material(obj):
@@ -135,8 +265,32 @@ def ensure_visible_material(obj):
         obj.data.materials.append(mat)
 
 
+def _mesh_bbox_np(objects):
+    """World-space (min, max) corners over all mesh vertices, or None if empty."""
+    wanted = {obj.name for obj in objects if obj.type == "MESH"}
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    arrays = []
+    # One pass over the evaluated scene; matrix_world here is already up to date
+    for inst in depsgraph.object_instances:
+        if inst.is_instance or inst.object.type != "MESH":
+            continue
+        if inst.object.original.name not in wanted:
+            continue
+        vertices = inst.object.data.vertices
+        n = len(vertices)
+        if n == 0:
+            continue
+        buf = np.empty(n * 3, dtype=np.float32)
+        vertices.foreach_get("co", buf)
+        M = np.array(inst.matrix_world, dtype=np.float32)
+        arrays.append(buf.reshape(n, 3) @ M[:3, :3].T + M[:3, 3])
+    if not arrays:
+        return None
+    verts = np.concatenate(arrays)
+    return verts.min(axis=0), verts.max(axis=0)
+
+
 def import_single_object(path, target_size=2.0):
-    bpy.ops.object.select_all(action='DESELECT')
     objects = import_object(path)
     if not objects:
         return []
@@ -144,41 +298,32 @@ def import_single_object(path, target_size=2.0):
     for obj in objects:
         ensure_visible_material(obj)
 
-    all_verts = []
-    for obj in objects:
-        for v in obj.data.vertices:
-            all_verts.append(obj.matrix_world @ v.co)
+    bbox = _mesh_bbox_np(objects)
 
     total_verts = sum(len(obj.data.vertices) for obj in objects)
     if total_verts < 4:
         print(f"  REJECT: too few vertices ({total_verts})")
         return []
 
-    if all_verts:
-        mn = [min(v[j] for v in all_verts) for j in range(3)]
-        mx = [max(v[j] for v in all_verts) for j in range(3)]
-        center = [(mn[j] + mx[j]) / 2 for j in range(3)]
-        dims = [mx[j] - mn[j] for j in range(3)]
-        size = max(dims)
+    if bbox is not None:
+        mn, mx = bbox
+        size = float((mx - mn).max())
 
         if size < 0.001:
             print(f"  REJECT: degenerate object (size={size})")
             return []
 
-        if size > 0:
-            sf = target_size / size
-            for obj in objects:
-                obj.location.x -= center[0]
-                obj.location.y -= center[1]
-                obj.location.z -= center[2]
-                obj.scale *= sf
+        center = mathutils.Vector((0.5 * (mn + mx)).tolist())
+        sf = target_size / size
+        for obj in objects:
+            obj.location -= center
+            obj.scale *= sf
     return objects
 
 
 def import_and_place_objects(object_paths, positions, scales):
     all_groups = []
     for i, path in enumerate(object_paths):
-        bpy.ops.object.select_all(action='DESELECT')
         objects = import_object(path)
         if not objects:
             continue
@@ -192,29 +337,20 @@ def import_and_place_objects(object_paths, positions, scales):
         for obj in objects:
             obj.parent = parent
 
-        all_verts = []
-        for obj in objects:
-            if obj.type == "MESH":
-                for v in obj.data.vertices:
-                    all_verts.append(obj.matrix_world @ v.co)
-
-        if all_verts:
-            mn = [min(v[j] for v in all_verts) for j in range(3)]
-            mx = [max(v[j] for v in all_verts) for j in range(3)]
-            center = [(mn[j] + mx[j]) / 2 for j in range(3)]
-            size = max(mx[j] - mn[j] for j in range(3))
+        bbox = _mesh_bbox_np(objects)
+        if bbox is not None:
+            mn, mx = bbox
+            size = float((mx - mn).max())
 
             if size > 0:
                 target_scale = scales[i] if i < len(scales) else 1.5
                 sf = target_scale / size
-                parent.location = (-center[0]*sf, -center[1]*sf, -center[2]*sf)
+                center = 0.5 * (mn + mx)
+                parent.location = (-center * sf).tolist()
                 parent.scale = (sf, sf, sf)
 
         if i < len(positions):
-            pos = positions[i]
-            parent.location.x += pos[0]
-            parent.location.y += pos[1]
-            parent.location.z += pos[2]
+            parent.location += mathutils.Vector(positions[i])
 
         all_groups.append((parent, objects))
     return all_groups
@@ -224,68 +360,71 @@ def import_and_place_objects(object_paths, positions, scales):
 # Animations
 # ============================================================
 
+def look_at_euler(locations, target):
+    """Closed-form equivalent of to_track_quat("-Z", "Y").to_euler() per row."""
+    d = np.asarray(target, dtype=np.float64) - locations
+    rot_x = np.arctan2(np.hypot(d[:, 0], d[:, 1]), -d[:, 2])
+    rot_z = np.unwrap(np.arctan2(-d[:, 0], d[:, 1]))
+    return np.stack([rot_x, np.zeros_like(rot_x), rot_z], axis=1)
+
+
+def set_camera_keyframes(camera, locations, rotations):
+    """Bulk-write per-frame location/rotation keyframes via foreach_set."""
+    num_frames = len(locations)
+    frames = np.arange(1, num_frames + 1, dtype=np.float32)
+
+    camera.animation_data_create()
+    action = bpy.data.actions.new(name="CameraAction")
+    camera.animation_data.action = action
+
+    co = np.empty(2 * num_frames, dtype=np.float32)
+    co[0::2] = frames
+    for data_path, values in (("location", locations), ("rotation_euler", rotations)):
+        for i in range(3):
+            fcurve = action.fcurves.new(data_path, index=i)
+            fcurve.keyframe_points.add(num_frames)
+            co[1::2] = values[:, i]
+            fcurve.keyframe_points.foreach_set("co", co)
+            fcurve.update()
+
+
 def create_orbit_animation(camera, num_frames, config):
     """360-degree orbit (shape_extrapolation, occlusion_dynamics)."""
-    scene = bpy.context.scene
-    scene.frame_start = 1
-    scene.frame_end = num_frames
-
     distance = config.get("camera_distance", 3.5)
     elevation = config.get("camera_elevation", 25.0)
     elev_rad = math.radians(elevation)
     rotations = config.get("rotations", 1.0)
 
-    for frame in range(1, num_frames + 1):
-        scene.frame_set(frame)
-        progress = (frame - 1) / num_frames
-        azimuth = progress * rotations * 2 * math.pi
+    progress = np.arange(num_frames, dtype=np.float64) / num_frames
+    azimuth = progress * rotations * 2 * math.pi
 
-        x = distance * math.cos(elev_rad) * math.cos(azimuth)
-        y = distance * math.cos(elev_rad) * math.sin(azimuth)
-        z = distance * math.sin(elev_rad)
+    locations = np.empty((num_frames, 3))
+    locations[:, 0] = distance * math.cos(elev_rad) * np.cos(azimuth)
+    locations[:, 1] = distance * math.cos(elev_rad) * np.sin(azimuth)
+    locations[:, 2] = distance * math.sin(elev_rad)
 
-        camera.location = (x, y, z)
-        direction = mathutils.Vector((0, 0, 0)) - camera.location
-        rot_quat = direction.to_track_quat("-Z", "Y")
-        camera.rotation_euler = rot_quat.to_euler()
-
-        camera.keyframe_insert(data_path="location", frame=frame)
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
+    set_camera_keyframes(camera, locations, look_at_euler(locations, (0, 0, 0)))
 
 
 def create_parallax_animation(camera, num_frames, config):
     """Lateral camera movement (depth_parallax)."""
-    scene = bpy.context.scene
-    scene.frame_start = 1
-    scene.frame_end = num_frames
-
     lateral_range = config.get("lateral_range", 3.5)
     camera_y = config.get("camera_forward_distance", 5.5)
     camera_z = config.get("camera_height", 1.8)
-    look_at = mathutils.Vector(config.get("look_at", [0.1, 1.0, 0]))
+    look_at = config.get("look_at", [0.1, 1.0, 0])
 
-    for frame in range(1, num_frames + 1):
-        scene.frame_set(frame)
-        progress = (frame - 1) / num_frames
-        x = -lateral_range / 2 + lateral_range * progress
-        y = -camera_y
-        z = camera_z
+    progress = np.arange(num_frames, dtype=np.float64) / num_frames
 
-        camera.location = (x, y, z)
-        direction = look_at - camera.location
-        rot_quat = direction.to_track_quat("-Z", "Y")
-        camera.rotation_euler = rot_quat.to_euler()
+    locations = np.empty((num_frames, 3))
+    locations[:, 0] = -lateral_range / 2 + lateral_range * progress
+    locations[:, 1] = -camera_y
+    locations[:, 2] = camera_z
 
-        camera.keyframe_insert(data_path="location", frame=frame)
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
+    set_camera_keyframes(camera, locations, look_at_euler(locations, look_at))
 
 
 def create_zoom_animation(camera, num_frames, config):
     """Pure zoom toward object (zoom_consistency)."""
-    scene = bpy.context.scene
-    scene.frame_start = 1
-    scene.frame_end = num_frames
-
     start_distance = config.get("start_distance", 4.0)
     end_distance = config.get("end_distance", 1.8)
     elevation = config.get("camera_elevation", 20.0)
@@ -293,69 +432,201 @@ def create_zoom_animation(camera, num_frames, config):
     elev_rad = math.radians(elevation)
     azim_rad = math.radians(azimuth)
 
-    for frame in range(1, num_frames + 1):
-        scene.frame_set(frame)
-        progress = (frame - 1) / num_frames
-        smooth_progress = 0.5 - 0.5 * math.cos(progress * math.pi)
-        distance = start_distance + (end_distance - start_distance) * smooth_progress
+    progress = np.arange(num_frames, dtype=np.float64) / num_frames
+    smooth_progress = 0.5 - 0.5 * np.cos(progress * math.pi)
+    distance = start_distance + (end_distance - start_distance) * smooth_progress
 
-        x = distance * math.cos(elev_rad) * math.cos(azim_rad)
-        y = distance * math.cos(elev_rad) * math.sin(azim_rad)
-        z = distance * math.sin(elev_rad)
+    locations = np.empty((num_frames, 3))
+    locations[:, 0] = distance * math.cos(elev_rad) * math.cos(azim_rad)
+    locations[:, 1] = distance * math.cos(elev_rad) * math.sin(azim_rad)
+    locations[:, 2] = distance * math.sin(elev_rad)
 
-        camera.location = (x, y, z)
-        direction = mathutils.Vector((0, 0, 0)) - camera.location
-        rot_quat = direction.to_track_quat("-Z", "Y")
-        camera.rotation_euler = rot_quat.to_euler()
+    set_camera_keyframes(camera, locations, look_at_euler(locations, (0, 0, 0)))
 
-        camera.keyframe_insert(data_path="location", frame=frame)
-        camera.keyframe_insert(data_path="rotation_euler", frame=frame)
 
+ANIMATIONS = {
+    "shape_extrapolation": create_orbit_animation,
+    "occlusion_dynamics": create_orbit_animation,
+    "depth_parallax": create_parallax_animation,
+    "zoom_consistency": create_zoom_animation,
+}
 
 # ============================================================
 # Render
 # ============================================================
 
-def render_video(output_path, fps=16):
+NVENC_ARGS = {
+    "h264": [
+        "-c:v", "h264_nvenc", "-preset", "llhp", "-tune", "ull",
+        "-zerolatency", "1", "-rc", "vbr", "-cq", "23",
+    ],
+    "hevc": [
+        "-c:v", "hevc_nvenc", "-preset", "p4", "-tune", "ull",
+        "-rc", "vbr", "-cq", "24", "-tag:v", "hvc1",
+    ],
+}
+NVENC_COMMON_ARGS = ["-delay", "0", "-bf", "0", "-surfaces", "6"]
+# Split-frame encoding across both NVENC engines (Ada-class dual-encoder GPUs)
+NVENC_SPLIT_ARGS = ["-multipass", "disabled", "-split_encode_mode", "forced"]
+X264_ARGS = [
+    "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency",
+    "-bf", "0", "-g", "15", "-crf", "23",
+]
+
+
+def encoder_args(use_nvenc=False, codec="h264", split_encode=False):
+    """ffmpeg video codec arguments for the requested encoder."""
+    if not use_nvenc:
+        return X264_ARGS
+    args = NVENC_ARGS[codec] + NVENC_COMMON_ARGS
+    if split_encode:
+        args += NVENC_SPLIT_ARGS
+    return args
+
+
+class FrameStream:
+    """
+    ffmpeg encoder fed one BMP file per frame over stdin. Frame files are
+    deleted once sent, except those in keep. Until NVENC has produced output
+    they are held back instead: if the NVENC session can't be opened (e.g.
+    the GPU's concurrent-session limit is reached) ffmpeg restarts on libx264
+    straight away and replays them.
+    """
+
+    def __init__(self, output_path, fps, use_nvenc=False, codec="h264", split_encode=False,
+                 keep=()):
+        self.output_path = output_path
+        self.fps = fps
+        self.codec = codec
+        self.split_encode = split_encode
+        self.keep = set(keep)
+        self.sent = []
+        self.replayable = True
+        Path(output_path).unlink(missing_ok=True)
+        self._start(use_nvenc)
+
+    def _start(self, use_nvenc):
+        self.use_nvenc = use_nvenc
+        self.proc = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "image2pipe", "-c:v", "bmp",
+             "-framerate", str(self.fps), "-i", "-"]
+            + encoder_args(use_nvenc, self.codec, self.split_encode)
+            + ["-pix_fmt", "yuv420p", self.output_path],
+            stdin=subprocess.PIPE,
+        )
+
+    def _send(self, path):
+        try:
+            self.proc.stdin.write(Path(path).read_bytes())
+            return True
+        except OSError:
+            return False
+
+    def _fallback(self):
+        print("  NVENC encode failed, falling back to libx264")
+        self.proc.kill()
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.wait()
+        self._start(False)
+        for path in self.sent:
+            if not self._send(path):
+                break
+
+    def _release(self):
+        for path in self.sent:
+            if path not in self.keep:
+                os.remove(path)
+        self.sent = []
+
+    def _encoder_open(self):
+        # ffmpeg writes the container header only once the encoder is open
+        try:
+            return os.path.getsize(self.output_path) > 0
+        except OSError:
+            return False
+
+    def write(self, path):
+        self.sent.append(path)
+        if not self._send(path) and self.use_nvenc and self.replayable:
+            self._fallback()
+        if not self.use_nvenc or self._encoder_open():
+            self.replayable = False
+            self._release()
+
+    def close(self):
+        """Finish the encode. Returns True if ffmpeg succeeded."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        if self.proc.wait() != 0 and self.use_nvenc and self.replayable:
+            self._fallback()
+            return self.close()
+        return self.proc.returncode == 0
+
+
+def save_png(src, dst):
+    """Re-save an image file as PNG through Blender's image API."""
+    img = bpy.data.images.load(str(src))
+    img.filepath_raw = str(dst)
+    img.file_format = "PNG"
+    if bpy.app.version >= (3, 4, 0):
+        img.save(quality=PNG_COMPRESSION)
+    else:
+        img.save()
+    bpy.data.images.remove(img)
+
+
+def render_video(output_path, fps=16, use_nvenc=False, codec="h264", split_encode=False,
+                 keyframes=None):
+    """
+    Render the scene's frame range to output_path. Frames are written as
+    uncompressed BMP and streamed into ffmpeg as each one lands, so no PNG is
+    deflated per frame, and only keyframes stay on disk. keyframes maps frame
+    numbers to PNG names kept next to the video, when inside the range.
+    """
     scene = bpy.context.scene
-    scene.render.image_settings.file_format = "FFMPEG"
-    scene.render.ffmpeg.format = "MPEG4"
-    scene.render.ffmpeg.codec = "H264"
-    scene.render.ffmpeg.constant_rate_factor = "MEDIUM"
+    output_dir = Path(output_path).parent
+    frames_dir = output_dir / f"{Path(output_path).stem}_frames"
+    scene.render.image_settings.file_format = "BMP"
+    scene.render.image_settings.color_mode = "RGB"
     scene.render.fps = fps
-    scene.render.filepath = output_path
-    bpy.ops.render.render(animation=True)
+    scene.render.filepath = str(frames_dir / "frame_")
 
+    keyframes = keyframes or {}
+    stream = FrameStream(output_path, fps, use_nvenc, codec, split_encode,
+                         keep=[scene.render.frame_path(frame=idx) for idx in keyframes])
 
-def save_keyframes(output_dir, num_frames):
-    scene = bpy.context.scene
-    for name, idx in [("first_frame.png", 1), ("final_frame.png", num_frames)]:
-        scene.frame_set(idx)
-        scene.render.filepath = str(Path(output_dir) / name)
-        scene.render.image_settings.file_format = "PNG"
-        bpy.ops.render.render(write_still=True)
+    def stream_frame(scene, *args):
+        stream.write(scene.render.frame_path(frame=scene.frame_current))
+
+    bpy.app.handlers.render_write.append(stream_frame)
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        bpy.app.handlers.render_write.remove(stream_frame)
+        encoded = stream.close()
+    if not encoded:
+        raise RuntimeError(f"ffmpeg failed to encode {output_path}")
+
+    for idx, name in keyframes.items():
+        if scene.frame_start <= idx <= scene.frame_end:
+            save_png(frames_dir / f"frame_{idx:04d}.bmp", output_dir / name)
+    shutil.rmtree(frames_dir, ignore_errors=True)
 
 
 # ============================================================
 # Main
 # ============================================================
 
-def main():
-    argv = sys.argv
-    if "--" in argv:
-        argv = argv[argv.index("--") + 1:]
-    else:
-        argv = []
-
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--task_config", type=str, required=True)
-    parser.add_argument("--object_paths", type=str, required=True)
-    parser.add_argument("--output_dir", type=str, required=True)
-    args = parser.parse_args(argv)
-
-    config = json.loads(args.task_config)
-    object_paths = json.loads(args.object_paths)
-    output_dir = Path(args.output_dir)
+def run_one(job, scene_template=None):
+    """Render one job dict (task_config, object_paths, output_dir). Returns success."""
+    config = job["task_config"]
+    object_paths = job["object_paths"]
+    output_dir = Path(job["output_dir"])
     output_dir.mkdir(parents=True, exist_ok=True)
 
     task_type = config.get("task_type", "shape_extrapolation")
@@ -367,50 +638,42 @@ def main():
     print(f"Task: {task_type}")
     print(f"  Objects: {len(object_paths)}, Resolution: {resolution}, Frames: {num_frames}")
 
-    # Setup scene
-    reset_scene()
-    setup_render_settings(resolution=resolution)
-    setup_background()
-    setup_ground_plane()
-    setup_lighting()
+    # Setup scene (lights, world, render settings, camera)
+    camera = load_scene(config, task_type, config.get("scene_template", scene_template))
 
     # Import objects
     if task_type in ("shape_extrapolation", "zoom_consistency"):
         objects = import_single_object(object_paths[0], target_size=2.0)
         if not objects:
             print("IMPORT_FAILED")
-            sys.exit(1)
+            return False
     else:
         positions = config.get("object_positions", [])
         scales = config.get("object_scales", [])
         object_groups = import_and_place_objects(object_paths, positions, scales)
         if not object_groups:
             print("IMPORT_FAILED")
-            sys.exit(1)
+            return False
 
-    # Camera
-    camera = setup_camera(
-        distance=config.get("camera_distance", 3.5),
-        elevation=config.get("camera_elevation", 25.0),
-    )
-
-    # Animation
-    if task_type in ("shape_extrapolation", "occlusion_dynamics"):
-        create_orbit_animation(camera, num_frames, config)
-    elif task_type == "depth_parallax":
-        create_parallax_animation(camera, num_frames, config)
-    elif task_type == "zoom_consistency":
-        create_zoom_animation(camera, num_frames, config)
-    else:
+    # Animation: keyframes are written directly, so scene time is never stepped.
+    if task_type not in ANIMATIONS:
         print(f"Unknown task type: {task_type}")
-        sys.exit(1)
+        return False
+    ANIMATIONS[task_type](camera, num_frames, config)
 
-    # Render
+    # Render; frame_range/video_name select one chunk of a clip split across workers
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = config.get("frame_range", (1, num_frames))
     print("Rendering video...")
-    render_video(str(output_dir / "ground_truth.mp4"), fps=fps)
+    render_video(str(output_dir / config.get("video_name", "ground_truth.mp4")), fps=fps,
+                 use_nvenc=config.get("use_nvenc", False),
+                 codec=config.get("video_codec", "h264"),
+                 split_encode=config.get("split_encode", False),
+                 keyframes={1: "first_frame.png", num_frames: "final_frame.png"})
 
-    print("Saving keyframes...")
-    save_keyframes(output_dir, num_frames)
+    if scene.frame_start != 1:
+        print("RENDER_SUCCESS")
+        return True
 
     # Metadata
     metadata = {
@@ -425,6 +688,48 @@ def main():
     (output_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
 
     print("RENDER_SUCCESS")
+    return True
+
+
+def serve(scene_template=None):
+    """Worker mode: render one JSON job per stdin line until EOF."""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            run_one(json.loads(line), scene_template)
+        except Exception:
+            traceback.print_exc()
+        print("RENDER_DONE", flush=True)
+
+
+def main():
+    argv = sys.argv
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--worker", action="store_true",
+                        help="Read JSON jobs from stdin instead of rendering once")
+    parser.add_argument("--job_file", type=str,
+                        help="JSON file with task_config, object_paths, output_dir")
+    parser.add_argument("--scene-template", type=str, default=None,
+                        help="Cache object-independent scene setup in this .blend")
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        serve(args.scene_template)
+        return
+
+    if not args.job_file:
+        parser.error("--job_file is required unless --worker is given")
+
+    job = json.loads(Path(args.job_file).read_text())
+    if not run_one(job, args.scene_template):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
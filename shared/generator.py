@@ -0,0 +1,177 @@
+"""Generator plumbing shared by the Blender render tasks (config, worker pool, results)."""
+
+import multiprocessing
+import random
+import tempfile
+from abc import abstractmethod
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from PIL import Image
+from pydantic import Field
+
+from core import BaseGenerator, GenerationConfig, TaskPair
+from .objects import attach_objects, load_objects, share_objects
+from .renderer import (
+    detect_encoder, find_blender, get_worker_pool, gpu_assignments, pin_worker_gpu,
+    render_with_retry, start_mps_daemon,
+)
+
+
+class RenderTaskConfig(GenerationConfig):
+    """Fields common to every render task; task configs add camera/object params."""
+    image_size: tuple[int, int] = Field(default=(1024, 1024))
+    fps: int = Field(default=16)
+    duration: float = Field(default=4.0)
+    render_engine: str = Field(default="BLENDER_EEVEE")
+    render_device: str = Field(default="OPTIX")
+    tile_size: int = Field(default=256)
+    frame_chunks: int = Field(default=1)
+    batch_size: int = Field(default=1)
+    use_mps: bool = Field(default=False)
+    workers: int = Field(default=16)
+    blender_path: Optional[str] = Field(default=None)
+    timeout: int = Field(default=600)
+    min_video_size: int = Field(default=50_000)
+    max_retries: int = Field(default=3)
+    object_list: Optional[str] = Field(default=None)
+
+
+def render_task_config(config: RenderTaskConfig, task_type: str) -> dict:
+    """Blender task_config keys shared by all tasks."""
+    return {
+        "task_type": task_type,
+        "resolution": config.image_size[0],
+        "fps": config.fps,
+        "duration": config.duration,
+        "engine": config.render_engine,
+        "device": config.render_device,
+        "tile_size": config.tile_size,
+        "frame_chunks": config.frame_chunks,
+        "use_mps": config.use_mps,
+    }
+
+
+# Per-process render state, set once by _init_worker so each job only pickles
+# its id and chosen objects; all_objs is kept for retry re-selection
+_STATE = None
+
+
+def _set_state(all_objs, *state):
+    global _STATE
+    _STATE = (all_objs, *state)
+
+
+def _init_worker(gpu_queue, objects_handle, *state):
+    """Pool initializer: pin the GPU and attach the shared object list once."""
+    pin_worker_gpu(gpu_queue)
+    _set_state(attach_objects(*objects_handle), *state)
+
+
+def _render_one(args):
+    task_id, work_dir, objs, prompt, retry_seed = args
+    all_objs, blender, task_cfg, num_objects, min_sz, retries, timeout = _STATE
+    out = Path(work_dir) / task_id
+    out.mkdir(parents=True, exist_ok=True)
+    ok = render_with_retry(blender, task_cfg, objs, all_objs, str(out),
+                           num_objects, min_sz, retries, timeout,
+                           pool=get_worker_pool(blender, task_cfg["frame_chunks"],
+                                                task_cfg["use_mps"]),
+                           rng=random.Random(retry_seed))
+    return {"task_id": task_id, "output_dir": str(out), "prompt": prompt, "success": ok}
+
+
+def _render_batch(batch):
+    """Render several samples back to back on this process's Blender worker."""
+    return [_render_one(args) for args in batch]
+
+
+class RenderTaskGenerator(BaseGenerator):
+    """
+    Base for the Objaverse render tasks. Subclasses set NUM_OBJECTS, PROMPTS
+    and WORK_PREFIX, and build_task_config(config) -> Blender task_config.
+    """
+
+    NUM_OBJECTS = 1
+    PROMPTS: List[str] = []
+    WORK_PREFIX = "render_"
+
+    def __init__(self, config: RenderTaskConfig, objects: Optional[List[str]] = None):
+        """objects: pre-resolved object paths; defaults to load_objects(config.object_list)."""
+        super().__init__(config)
+        self.blender = find_blender(config.blender_path)
+        self.objects = list(objects) if objects is not None else load_objects(config.object_list)
+        self._work_dir = tempfile.mkdtemp(prefix=self.WORK_PREFIX)
+        # Private RNG: seeded runs are reproducible without touching global state
+        self._rng = random.Random(config.random_seed)
+        self._task_cfg = self.build_task_config(config)
+        # MPS is started here, before any pool worker pins a GPU, so the daemon
+        # sees every device; workers only join it
+        self._task_cfg["use_mps"] = config.use_mps and start_mps_daemon()
+        # Probe the video encoder once here; workers inherit the decision
+        self._task_cfg.update(detect_encoder())
+        # Shared placeholder for failed samples; never mutated
+        self._blank = Image.new("RGB", config.image_size, (0, 0, 0))
+        self._task_cfg["scene_template"] = str(Path(self._work_dir) / "scene_template.blend")
+        print(f"Blender: {self.blender}")
+        print(f"Objects: {len(self.objects)} verified 3D models")
+
+    @abstractmethod
+    def build_task_config(self, config: RenderTaskConfig) -> dict:
+        """Blender task_config for this task (see render_task_config)."""
+
+    def _pick_objects(self) -> List[str]:
+        return self._rng.sample(self.objects, min(self.NUM_OBJECTS, len(self.objects)))
+
+    def _worker_state(self) -> tuple:
+        return (self.blender, self._task_cfg, self.NUM_OBJECTS, self.config.min_video_size,
+                self.config.max_retries, self.config.timeout)
+
+    def generate_task_pair(self, task_id: str) -> TaskPair:
+        _set_state(self.objects, *self._worker_state())
+        result = _render_one((task_id, self._work_dir, self._pick_objects(),
+                              self._rng.choice(self.PROMPTS), self._rng.getrandbits(32)))
+        return self._result_to_pair(result)
+
+    def generate_dataset_iter(self) -> Iterator[TaskPair]:
+        n = self.config.num_samples
+        workers = min(self.config.workers, n)
+        print(f"\nGenerating {n} samples with {workers} parallel workers...")
+
+        prompts = self._rng.choices(self.PROMPTS, k=n)
+        args_list = [
+            (f"{self.config.domain}_{i:06d}", self._work_dir,
+             self._pick_objects(), prompts[i], self._rng.getrandbits(32))
+            for i in range(n)
+        ]
+        # batch_size samples per submission; larger batches trade load balance
+        # for fewer pool round trips
+        size = max(1, self.config.batch_size)
+        batches = [args_list[i:i + size] for i in range(0, n, size)]
+
+        # spawn: workers start from a clean interpreter instead of a fork of
+        # this process (PIL, pydantic, the object catalog, ...)
+        ctx = multiprocessing.get_context("spawn")
+        shm, handle = share_objects(self.objects)
+        try:
+            yield from self._parallel_render_iter(
+                _render_batch, batches, workers, initializer=_init_worker,
+                initargs=(gpu_assignments(workers, ctx), handle, *self._worker_state()),
+                mp_context=ctx,
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _result_to_pair(self, result):
+        if not result["success"]:
+            return TaskPair(task_id=result["task_id"], domain=self.config.domain,
+                            prompt=result["prompt"], first_image=self._blank,
+                            final_image=self._blank)
+        d = Path(result["output_dir"])
+        return TaskPair(
+            task_id=result["task_id"], domain=self.config.domain, prompt=result["prompt"],
+            first_image=d / "first_frame.png",
+            final_image=d / "final_frame.png",
+            ground_truth_video=str(d / "ground_truth.mp4"),
+        )
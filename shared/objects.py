@@ -1,10 +1,86 @@
 """Object loader: resolves Objaverse UIDs to local .glb paths."""
 
+import hashlib
+import json
+import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 _PACKAGE_DIR = Path(__file__).resolve().parent.parent
 _DEFAULT_ASSETS = _PACKAGE_DIR / "assets" / "good_objects.txt"
+_RESOLVE_CACHE_DIR = Path.home() / ".cache" / "objaverse_resolve"
+
+
+def _list_dir(directory: str) -> set:
+    try:
+        with os.scandir(directory or ".") as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _filter_existing(paths: Iterable[str]) -> List[str]:
+    """
+    Keep the paths that exist, in order. Lists each parent directory once
+    (in parallel) instead of calling stat() per file.
+    """
+    paths = [str(p) for p in paths]
+    by_dir = defaultdict(set)
+    for p in paths:
+        by_dir[os.path.dirname(p)].add(os.path.basename(p))
+    dirs = list(by_dir)
+    with ThreadPoolExecutor(max_workers=min(16, max(len(dirs), 1))) as ex:
+        listings = dict(zip(dirs, ex.map(_list_dir, dirs)))
+    return [p for p in paths if os.path.basename(p) in listings[os.path.dirname(p)]]
+
+
+def _read_resolve_cache(cache_file: Path) -> Optional[Dict[str, str]]:
+    """Cached {uid: path}, or None if missing or any path no longer exists."""
+    try:
+        uid_to_path = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        return None
+    if not uid_to_path:
+        return None
+    if len(_filter_existing(uid_to_path.values())) != len(uid_to_path):
+        return None
+    return uid_to_path
+
+
+def _write_resolve_cache(cache_file: Path, uid_to_path: Dict[str, str]):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(uid_to_path))
+        tmp.replace(cache_file)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def _resolve_uids(uids: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Resolve UIDs to existing local paths, via an on-disk cache keyed by the UID list."""
+    key = hashlib.sha1("\n".join(sorted(uids)).encode()).hexdigest()
+    cache_file = _RESOLVE_CACHE_DIR / f"{key}.json"
+
+    uid_to_path = _read_resolve_cache(cache_file)
+    if uid_to_path is None:
+        import objaverse
+
+        print(f"Resolving {len(uids)} Objaverse UIDs to local paths...")
+        resolved = objaverse.load_objects(uids=list(uids), download_processes=8)
+        candidates = {uid: str(p) for uid, p in resolved.items() if p}
+        existing = set(_filter_existing(candidates.values()))
+        uid_to_path = {uid: p for uid, p in candidates.items() if p in existing}
+        if uid_to_path:
+            _write_resolve_cache(cache_file, uid_to_path)
+
+    return tuple(uid_to_path[uid] for uid in uids if uid in uid_to_path)
 
 
 def load_objects(object_list: Optional[str] = None) -> List[str]:
@@ -13,6 +89,8 @@ def load_objects(object_list: Optional[str] = None) -> List[str]:
 
     If object_list points to a file with absolute .glb paths, uses them directly.
     If it contains Objaverse UIDs (32-char hex), resolves via objaverse API.
+    Resolved paths are cached in ~/.cache/objaverse_resolve/ and reused while
+    every cached file still exists.
     """
     path = Path(object_list) if object_list else _DEFAULT_ASSETS
     if not path.exists():
@@ -28,25 +106,37 @@ def load_objects(object_list: Optional[str] = None) -> List[str]:
     sample = lines[0]
     if "/" in sample or sample.endswith(".glb"):
         # Already absolute paths
-        valid = [p for p in lines if Path(p).exists()]
+        valid = _filter_existing(lines)
         if not valid:
             raise FileNotFoundError(f"No valid .glb files found from {path}")
         return valid
 
     # Objaverse UIDs — resolve to local paths
-    import objaverse
-
-    print(f"Resolving {len(lines)} Objaverse UIDs to local paths...")
-    uid_to_path = objaverse.load_objects(uids=lines, download_processes=8)
-
-    valid = []
-    for uid in lines:
-        p = uid_to_path.get(uid)
-        if p and Path(p).exists():
-            valid.append(str(p))
+    valid = list(_resolve_uids(tuple(lines)))
 
     if not valid:
         raise FileNotFoundError("No objects could be resolved. Check Objaverse cache.")
 
     print(f"  Resolved {len(valid)}/{len(lines)} objects")
     return valid
+
+
+def share_objects(objects: List[str]) -> Tuple[SharedMemory, Tuple[str, int]]:
+    """
+    Pickle the object list into a shared-memory block so pool workers can
+    attach to it instead of receiving a copy. Returns the block (owner must
+    close() and unlink() it) and the (name, size) handle for attach_objects.
+    """
+    data = pickle.dumps(list(objects), protocol=pickle.HIGHEST_PROTOCOL)
+    shm = SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[:len(data)] = data
+    return shm, (shm.name, len(data))
+
+
+def attach_objects(name: str, size: int) -> List[str]:
+    """Load an object list published by share_objects."""
+    shm = SharedMemory(name=name)
+    try:
+        return pickle.loads(shm.buf[:size])
+    finally:
+        shm.close()
@@ -1,14 +1,23 @@
 """Python-side Blender subprocess caller with retry logic."""
 
+import atexit
 import json
+import multiprocessing
+import os
+import queue
 import random
 import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 _PACKAGE_DIR = Path(__file__).resolve().parent.parent
 _BLENDER_SCRIPT = str(_PACKAGE_DIR / "shared" / "blender_render.py")
+_PIPE_BUFSIZE = 1024 * 1024
 
 
 def find_blender(blender_path: Optional[str] = None) -> str:
@@ -34,6 +43,150 @@ def find_blender(blender_path: Optional[str] = None) -> str:
     )
 
 
+# GPUs with two or more NVENC engines that support split-frame encoding
+# (nvidia-smi names, without the "NVIDIA " prefix some drivers add)
+_SPLIT_ENCODE_GPUS = frozenset({
+    "L40", "L40S", "L20", "L4",
+    "RTX 6000 Ada Generation", "RTX 5000 Ada Generation",
+    "GeForce RTX 4090", "GeForce RTX 4080", "GeForce RTX 4080 SUPER",
+})
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_encoders() -> str:
+    if not shutil.which("ffmpeg"):
+        return ""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=30,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return ""
+    return result.stdout if result.returncode == 0 else ""
+
+
+@lru_cache(maxsize=None)
+def _encoder_help(encoder: str) -> str:
+    """ffmpeg's option listing for one encoder ("" if unavailable)."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-h", f"encoder={encoder}"],
+            capture_output=True, text=True, timeout=30,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return ""
+    return result.stdout if result.returncode == 0 else ""
+
+
+@lru_cache(maxsize=None)
+def _gpu_names() -> tuple:
+    if not shutil.which("nvidia-smi"):
+        return ()
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+            capture_output=True, text=True, timeout=30,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return ()
+    return tuple(line.strip() for line in result.stdout.splitlines() if line.strip())
+
+
+def detect_gpus() -> List[str]:
+    """Visible GPU ids: CUDA_VISIBLE_DEVICES if set, otherwise all from nvidia-smi."""
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is not None:
+        return [g.strip() for g in visible.split(",") if g.strip() not in ("", "-1")]
+    return [str(i) for i in range(len(_gpu_names()))]
+
+
+def gpu_assignments(workers: int, mp_context=None):
+    """
+    Queue of one GPU id per pool worker (round-robin), or None without GPUs.
+    Pass the pool's mp_context so the queue can be handed to its workers.
+    """
+    gpus = detect_gpus()
+    if not gpus:
+        return None
+    gpu_queue = (mp_context or multiprocessing).Queue()
+    for i in range(workers):
+        gpu_queue.put(gpus[i % len(gpus)])
+    return gpu_queue
+
+
+def pin_worker_gpu(gpu_queue):
+    """Pool initializer: pin this worker, and the Blender it starts, to one GPU."""
+    if gpu_queue is not None:
+        os.environ["CUDA_VISIBLE_DEVICES"] = gpu_queue.get()
+
+
+def nvenc_available() -> bool:
+    """Check whether the local ffmpeg build can encode with h264_nvenc."""
+    return bool(_gpu_names()) and "h264_nvenc" in _ffmpeg_encoders()
+
+
+def _split_encode_supported() -> bool:
+    """Dual-NVENC GPU present and this ffmpeg build knows -split_encode_mode."""
+    names = {name[len("NVIDIA "):] if name.startswith("NVIDIA ") else name
+             for name in _gpu_names()}
+    return bool(names & _SPLIT_ENCODE_GPUS) and "split_encode_mode" in _encoder_help("hevc_nvenc")
+
+
+def encoder_settings(nvenc_codec: Optional[str]) -> dict:
+    """
+    Video-encoding keys for task_config, given the NVENC codec that works on
+    this host ("hevc" or "h264"), or None for libx264. Split-frame encoding
+    is enabled for HEVC on dual-encoder GPUs when ffmpeg supports it.
+    """
+    return {
+        "use_nvenc": nvenc_codec is not None,
+        "video_codec": nvenc_codec or "h264",
+        "split_encode": nvenc_codec == "hevc" and _split_encode_supported(),
+    }
+
+
+def _pilot_encode(encoder: str) -> bool:
+    """Encode a few black frames with encoder; False if it can't open a session."""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", "color=c=black:s=64x64:d=0.1",
+        "-c:v", encoder, "-f", "null", "-",
+    ]
+    try:
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+    return result.returncode == 0
+
+
+@lru_cache(maxsize=None)
+def detect_encoder() -> dict:
+    """
+    Encoding keys for task_config (see encoder_settings): HEVC NVENC if a
+    pilot encode with it succeeds (smaller files at the same quality), then
+    H.264 NVENC, else libx264. Call once in the parent and ship the result
+    with every job, so all workers encode the same way instead of each
+    probing (and racing for encoder sessions) on its own. FrameStream still
+    drops a clip to libx264 if NVENC can't open a session later.
+    """
+    if nvenc_available():
+        for codec in ("hevc", "h264"):
+            encoder = f"{codec}_nvenc"
+            if encoder in _ffmpeg_encoders() and _pilot_encode(encoder):
+                return encoder_settings(codec)
+    return encoder_settings(None)
+
+
+def _with_encoder(task_config: dict) -> dict:
+    """task_config with detect_encoder() defaults unless the caller chose already."""
+    if "use_nvenc" in task_config:
+        return task_config
+    return {**detect_encoder(), **task_config}
+
+
 def render_video_task(
     blender_path: str,
     task_config: dict,
@@ -46,7 +199,8 @@ def render_video_task(
 
     Args:
         blender_path: Path to Blender binary
-        task_config: Dict with task_type, resolution, fps, duration, camera params
+        task_config: Dict with task_type, resolution, fps, duration, camera params.
+            Encoding keys default to detect_encoder() for this host.
         object_paths: List of .glb file paths
         output_dir: Where to save output files
         timeout: Subprocess timeout in seconds
@@ -54,20 +208,324 @@ def render_video_task(
     Returns:
         True if render succeeded
     """
+    job = {
+        "task_config": _with_encoder(task_config),
+        "object_paths": object_paths,
+        "output_dir": output_dir,
+    }
+    job_file = Path(output_dir) / "job.json"
+    job_file.parent.mkdir(parents=True, exist_ok=True)
+    job_file.write_text(json.dumps(job))
     cmd = [
         blender_path, "--background",
         "--python", _BLENDER_SCRIPT, "--",
-        "--task_config", json.dumps(task_config),
-        "--object_paths", json.dumps(object_paths),
-        "--output_dir", output_dir,
+        "--job_file", str(job_file),
     ]
     try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            bufsize=_PIPE_BUFSIZE,
+        )
+    except OSError:
+        return False
+    killer = threading.Timer(timeout, proc.kill)
+    killer.start()
+    try:
+        found = _scan_for(proc.stdout, b"RENDER_SUCCESS")
+        return proc.wait() == 0 and found
+    finally:
+        killer.cancel()
+        proc.stdout.close()
+
+
+def _scan_for(stream, marker: bytes) -> bool:
+    """
+    Read a binary pipe to EOF, reporting whether marker appeared. Blender's
+    stdout is megabytes of progress text, so it is scanned as raw chunks
+    rather than decoded and kept.
+    """
+    found = False
+    tail = b""
+    while True:
+        chunk = stream.read1(_PIPE_BUFSIZE)
+        if not chunk:
+            return found
+        if not found:
+            window = tail + chunk
+            found = marker in window
+            tail = window[-len(marker):]
+
+
+_MPS_ENV = {
+    "CUDA_MPS_PIPE_DIRECTORY": "/tmp/nvidia-mps",
+    "CUDA_MPS_LOG_DIRECTORY": "/tmp/nvidia-mps-log",
+}
+
+
+def _mps_running() -> bool:
+    return (Path(_MPS_ENV["CUDA_MPS_PIPE_DIRECTORY"]) / "control").exists()
+
+
+def _stop_mps_daemon():
+    try:
+        subprocess.run(
+            ["nvidia-cuda-mps-control"], input=b"quit\n", env={**os.environ, **_MPS_ENV},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+
+
+@lru_cache(maxsize=None)
+def start_mps_daemon() -> bool:
+    """
+    Start the NVIDIA MPS control daemon so concurrent Blender processes share
+    one GPU context instead of time-slicing. Returns True if MPS is usable.
+
+    Call this in the parent before any worker is pinned to a GPU: the daemon
+    and the server it spawns inherit this process's CUDA_VISIBLE_DEVICES. A
+    daemon started here is told to quit at exit; one already running is reused
+    and left alone.
+    """
+    if _mps_running():
+        return True
+    if not shutil.which("nvidia-cuda-mps-control"):
+        return False
+    for d in _MPS_ENV.values():
+        Path(d).mkdir(parents=True, exist_ok=True)
+    try:
+        subprocess.run(
+            ["nvidia-cuda-mps-control", "-d"], env={**os.environ, **_MPS_ENV},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+    if not _mps_running():
+        return False
+    atexit.register(_stop_mps_daemon)
+    return True
+
+
+class _BlenderWorker:
+    """One long-lived Blender process rendering JSON jobs read from stdin."""
+
+    def __init__(self, blender_path: str, env: Optional[Dict[str, str]] = None):
+        self.blender_path = blender_path
+        self.env = env
+        self.proc: Optional[subprocess.Popen] = None
+        self._markers: "queue.Queue[Optional[bytes]]" = queue.Queue()
+
+    def start(self):
+        cmd = [
+            self.blender_path, "--background",
+            "--python", _BLENDER_SCRIPT, "--", "--worker",
+        ]
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, bufsize=_PIPE_BUFSIZE,
+            env={**os.environ, **self.env} if self.env else None,
+        )
+        self._markers = queue.Queue()
+        threading.Thread(
+            target=self._pump, args=(self.proc.stdout, self._markers), daemon=True
+        ).start()
+
+    @staticmethod
+    def _pump(stream, markers):
+        """Forward only the RENDER_* protocol lines from Blender's stdout."""
+        tail = b""
+        while True:
+            chunk = stream.read1(_PIPE_BUFSIZE)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line.startswith(b"RENDER_"):
+                    markers.put(line.strip())
+        markers.put(None)
+
+    def render(self, job: dict, timeout: int) -> bool:
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        deadline = time.monotonic() + timeout
+        success = False
+        try:
+            self.proc.stdin.write(json.dumps(job).encode() + b"\n")
+            self.proc.stdin.flush()
+            while True:
+                marker = self._markers.get(timeout=max(0.0, deadline - time.monotonic()))
+                if marker is None:
+                    break
+                if marker == b"RENDER_SUCCESS":
+                    success = True
+                elif marker == b"RENDER_DONE":
+                    return success
+        except (queue.Empty, OSError):
+            pass
+        # Timed out or Blender died mid-job: restart on the next call
+        self.stop()
+        return False
+
+    def stop(self):
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+
+
+class BlenderWorkerPool:
+    """
+    Pool of persistent Blender processes, so startup is paid once per worker.
+
+    Workers inherit this process's CUDA_VISIBLE_DEVICES (see pin_worker_gpu).
+    With use_mps, workers join the MPS daemon if one is running; start it
+    with start_mps_daemon in the unpinned parent.
+
+    Usage:
+        with BlenderWorkerPool(blender_path, size=4) as pool:
+            ok = pool.render(task_config, object_paths, output_dir)
+    """
+
+    def __init__(
+        self,
+        blender_path: str,
+        size: int = 1,
+        use_mps: bool = False,
+    ):
+        env = {}
+        if use_mps and _mps_running():
+            env.update(_MPS_ENV)
+            env["CUDA_DEVICE_MAX_CONNECTIONS"] = "32"
+        self._workers = [_BlenderWorker(blender_path, env) for _ in range(size)]
+        self._idle: "queue.Queue[_BlenderWorker]" = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def render(
+        self,
+        task_config: dict,
+        object_paths: List[str],
+        output_dir: str,
+        timeout: int = 600,
+    ) -> bool:
+        """
+        Render one video. Same contract as render_video_task.
+
+        With task_config["frame_chunks"] = K > 1, the frame range is split into
+        K chunks rendered concurrently on K workers and joined with ffmpeg.
+        """
+        task_config = _with_encoder(task_config)
+        num_frames = int(task_config.get("fps", 16) * task_config.get("duration", 4.0))
+        chunks = max(1, min(task_config.get("frame_chunks", 1), num_frames))
+        if chunks == 1:
+            return self._run(task_config, object_paths, output_dir, timeout)
+
+        edges = [1 + (i * num_frames) // chunks for i in range(chunks + 1)]
+        names = [f"chunk_{i:03d}.mp4" for i in range(chunks)]
+        configs = [
+            {**task_config, "frame_range": [edges[i], edges[i + 1] - 1], "video_name": names[i]}
+            for i in range(chunks)
+        ]
+        with ThreadPoolExecutor(max_workers=chunks) as ex:
+            results = list(ex.map(
+                lambda cfg: self._run(cfg, object_paths, output_dir, timeout), configs
+            ))
+        out = Path(output_dir)
+        ok = all(results) and concat_videos(
+            [out / name for name in names], out / "ground_truth.mp4"
         )
-        return result.returncode == 0 and "RENDER_SUCCESS" in result.stdout
-    except (subprocess.TimeoutExpired, Exception):
+        for name in names:
+            (out / name).unlink(missing_ok=True)
+        return ok
+
+    def _run(self, task_config, object_paths, output_dir, timeout) -> bool:
+        job = {
+            "task_config": task_config,
+            "object_paths": object_paths,
+            "output_dir": output_dir,
+        }
+        worker = self._idle.get()
+        try:
+            return worker.render(job, timeout)
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        for worker in self._workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _video_codec(path: Path) -> str:
+    """Codec name of the first video stream ("" if ffprobe can't tell)."""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=codec_name", "-of", "csv=p=0", str(path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+    except (subprocess.TimeoutExpired, OSError):
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def concat_videos(parts: List[Path], output_path: Path) -> bool:
+    """
+    Join videos in order. Parts with one shared codec are stream-copied
+    (concat demuxer). If they differ, e.g. one chunk fell back from NVENC to
+    libx264, they are decoded and re-encoded with libx264 instead, since a
+    stream copy would mux mismatched streams into a broken file.
+    """
+    codecs = {_video_codec(p) for p in parts}
+    if len(codecs) == 1 and "" not in codecs:
+        list_file = output_path.with_name("concat.txt")
+        list_file.write_text("".join(f"file '{p.resolve()}'\n" for p in parts))
+        cmd = [
+            "ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+            "-i", str(list_file), "-c", "copy", str(output_path),
+        ]
+    else:
+        list_file = None
+        inputs = [arg for p in parts for arg in ("-i", str(p))]
+        streams = "".join(f"[{i}:v:0]" for i in range(len(parts)))
+        cmd = [
+            "ffmpeg", "-y", "-loglevel", "error", *inputs,
+            "-filter_complex", f"{streams}concat=n={len(parts)}:v=1:a=0[v]", "-map", "[v]",
+            "-c:v", "libx264", "-preset", "ultrafast", "-crf", "23", "-pix_fmt", "yuv420p",
+            str(output_path),
+        ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
         return False
+    finally:
+        if list_file is not None:
+            list_file.unlink(missing_ok=True)
+    return result.returncode == 0
+
+
+_POOLS: Dict[str, BlenderWorkerPool] = {}
+
+
+def get_worker_pool(blender_path: str, size: int = 1, use_mps: bool = False) -> BlenderWorkerPool:
+    """Process-wide pool for blender_path (options fixed on first use), closed at exit."""
+    pool = _POOLS.get(blender_path)
+    if pool is None:
+        pool = _POOLS[blender_path] = BlenderWorkerPool(blender_path, size, use_mps)
+        atexit.register(pool.close)
+    return pool
 
 
 def render_with_retry(
@@ -80,10 +538,14 @@ def render_with_retry(
     min_video_size: int = 50_000,
     max_retries: int = 3,
     timeout: int = 600,
+    pool: Optional[BlenderWorkerPool] = None,
+    rng: Optional[random.Random] = None,
 ) -> bool:
     """
-    Render with automatic retry using different objects on failure.
+    Render with automatic retry using different objects (drawn from rng, or
+    the random module) on failure.
 
+    Renders on pool if given, otherwise spawns one Blender process per attempt.
     Returns True if a valid video (> min_video_size bytes) was produced.
     """
     out = Path(output_dir)
@@ -92,11 +554,17 @@ def render_with_retry(
     for attempt in range(max_retries):
         # Clean previous attempt
         for f in out.glob("*"):
-            f.unlink()
+            if f.is_dir():
+                shutil.rmtree(f)
+            else:
+                f.unlink()
 
-        success = render_video_task(
-            blender_path, task_config, current_objs, str(out), timeout
-        )
+        if pool is not None:
+            success = pool.render(task_config, current_objs, str(out), timeout)
+        else:
+            success = render_video_task(
+                blender_path, task_config, current_objs, str(out), timeout
+            )
 
         video_file = out / "ground_truth.mp4"
         if success and video_file.exists() and video_file.stat().st_size > min_video_size:
@@ -104,7 +572,7 @@ def render_with_retry(
 
         # Retry with different objects
         if attempt < max_retries - 1 and all_objects:
-            current_objs = random.sample(
+            current_objs = (rng or random).sample(
                 all_objects, min(num_objects, len(all_objects))
             )
 
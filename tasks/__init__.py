@@ -13,7 +13,7 @@ TASK_NAMES = list(TASK_REGISTRY.keys())
 
 
 def get_task(name: str):
-    """Get task module by name. Returns module with TaskConfig, TaskGenerator, get_prompt."""
+    """Get task module by name. Returns module with TaskConfig, TaskGenerator, PROMPTS."""
     if name not in TASK_REGISTRY:
         raise ValueError(f"Unknown task: {name}. Available: {TASK_NAMES}")
     return TASK_REGISTRY[name]